@@ -14,6 +14,14 @@ python -m PyCheckout.terminal_checkout
 
 See more information on using the terminal implementation, see `PyCheckout.terminal_checkout`
 
+## Optional Dependencies
+
+If installed, the following packages are used to speed up checkout, but are not required:
+
+- `orjson` or `pysimdjson`: Faster parsing of JSON baskets
+- `ijson`: Streaming of input files in `PyCheckout.terminal_checkout`
+- `numpy`: Vectorised bulk pricing with `PyCheckout.checkout.PricingInfo.calculate_total_cost_batch`
+
 # Tests
 
 Tests can be run using the command
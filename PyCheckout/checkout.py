@@ -1,7 +1,22 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from itertools import chain, starmap, tee
 import json
-from typing import Dict, List, Optional, Union
+from operator import itemgetter
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Task Comment: orjson and simdjson are optional, faster parsers for basket JSON, used in that
+# .. order of preference. The standard library parser is used when neither is installed.
+try:
+    import orjson as _json
+except ImportError:
+    try:
+        import simdjson as _json
+    except ImportError:
+        _json = json
+
+_INT64_MAX = 2**63 - 1
 
 # Task Comment: Having an entire class for just the product name is overkill in this context.
 # .. But is built as a class so as to make it easier to extend, as it would likely need to be in a
@@ -12,6 +27,7 @@ from typing import Dict, List, Optional, Union
 # .. change between PriceInfo datasets.
 
 
+@dataclass(frozen=True, slots=True)
 class Product:
     """Encapsulates a single product."""
 
@@ -23,10 +39,11 @@ class Product:
         # .. if product names can overlap
         return self.name
 
-    def __init__(self, name) -> None:
-        assert isinstance(name, str)
+    def __post_init__(self):
+        assert isinstance(self.name, str)
 
-        self.name = name
+        # Interned, as product IDs are used as dict keys
+        object.__setattr__(self, "name", sys.intern(self.name))
 
 
 # Task Comment: Similarly, having a whole abstract class interface for Price Modifiers is overkill
@@ -41,15 +58,15 @@ class AbstractPriceModifier(ABC):
     """A base class for Price Modifiers."""
 
     @abstractmethod
-    def modified_price(self, unit_price: float, quantity: int) -> float:
+    def modified_price(self, unit_price: int, quantity: int) -> int:
         """Calculates the price of a quantity of items with modifier applied
 
         Args:
-            unit_price (float): The base, individual price of an item
+            unit_price (int): The base, individual price of an item
             quantity (int): The quantity of the item in the basket
 
         Returns:
-            float: The modified price
+            int: The modified price
         """
 
 
@@ -57,57 +74,62 @@ class ComboDealPriceModifier(AbstractPriceModifier):
     """A price modifier for combo-deals which define a given price for each set of items
     e.g. '3 for 140' or '2 for 60'."""
 
-    combo_price: float
+    combo_price: int
     per_amount: int
 
     def __init__(self, combo_price, per_amount) -> None:
-        try:
-            float(combo_price)  # Check that combo_price can be cast to float
-        except ValueError as ex:
-            raise ValueError("combo_price must be castable to float") from ex
-
-        try:
-            assert isinstance(per_amount, int) and per_amount > 0
-        except AssertionError as ex:
-            raise ValueError("per_amount must be an int > 0") from ex
+        if not isinstance(combo_price, int):
+            raise ValueError("combo_price must be an int")
+        if not (isinstance(per_amount, int) and per_amount > 0):
+            raise ValueError("per_amount must be an int > 0")
 
         self.combo_price = combo_price
         self.per_amount = per_amount
 
         super().__init__()
 
-    def modified_price(self, unit_price: float, quantity: int) -> float:
-        try:
-            float(unit_price)
-        except ValueError as ex:
-            raise ValueError("unit_price must be castable to float") from ex
-        try:
-            assert isinstance(quantity, int) and quantity >= 0
-        except AssertionError as ex:
-            raise ValueError("Quantity must be an int >= 0") from ex
+    def modified_price(self, unit_price: int, quantity: int) -> int:
+        if not isinstance(unit_price, int):
+            raise ValueError("unit_price must be an int")
+        if not (isinstance(quantity, int) and quantity >= 0):
+            raise ValueError("Quantity must be an int >= 0")
 
         deal_price = (quantity // self.per_amount) * self.combo_price
         remaining_price = (quantity % self.per_amount) * unit_price
         return deal_price + remaining_price
 
 
+def _combo_vec(combo_prices, per_amounts, unit_prices, quantities):
+    """Calculates the combo-deal price of each product's quantity.
+
+    All arguments are equal length arrays, indexed by product. Products without a combo-deal
+    are given a "1 for unit price" deal, so that all products are priced the same way.
+    """
+    deal_prices = (quantities // per_amounts) * combo_prices
+    remaining_prices = (quantities % per_amounts) * unit_prices
+    return deal_prices + remaining_prices
+
+
 @dataclass
 class ProductPricing:
-    """The pricing information for a single product, including an optional modifier."""
+    """The pricing information for a single product, including an optional modifier.
+
+    Prices are ints in the smallest unit of the currency (e.g. pence), so that they are exact.
+    """
 
     product: Product
-    unit_price: float
+    unit_price: int
     price_modifier: Optional[AbstractPriceModifier] = None
 
     def __post_init__(self):
         assert isinstance(self.product, Product), "product must be of type Product"
-        float(self.unit_price)
+        assert isinstance(self.unit_price, int), "unit_price must be an int"
         assert isinstance(
             self.price_modifier, Optional[AbstractPriceModifier]
         ), "price_modifier must be of type AbstractTypeModifier or None"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BasketItem:
     """A single item in a basket."""
 
@@ -123,13 +145,30 @@ class BasketItem:
             raise ValueError("Invalid Basket Item") from ex
 
 
+_get_code_and_quantity = itemgetter("code", "quantity")
+
+
+def _check_basket_item(item) -> BasketItem:
+    """Checks that an element of a basket is a `BasketItem`.
+
+    Raises:
+        ValueError: The element is not a `BasketItem`.
+    """
+    if not isinstance(item, BasketItem):
+        raise ValueError(f"Invalid Basket Format, {item!r} is not a BasketItem")
+    return item
+
+
 class PricingInfo:
     """A Pricing dataset, storing the prices and modifiers for each product."""
 
     product_pricings: dict[str, ProductPricing]  # Product IDs to Pricing
 
     def __init__(
-        self, product_pricings: dict[str, ProductPricing] | List[ProductPricing]
+        self,
+        product_pricings: dict[str, ProductPricing] | List[ProductPricing],
+        *,
+        validate: bool = True,
     ) -> None:
         """Creates a `PricingInfo` instance.
 
@@ -137,6 +176,9 @@ class PricingInfo:
             product_pricings (dict[str, ProductPricing] | List[ProductPricing]):
                 The pricings to include in the `PricingInfo`, provided as either a
                 {ProductID: ProductPricing} `dict`, or just a `list` of `ProductPricing`s.
+            validate (bool, optional): Whether to check the type of every pricing given.
+                Can be disabled for pricings that are already known to be valid.
+                Defaults to True.
 
         Raises:
             ValueError: ProductPricings given are not valid.
@@ -146,22 +188,25 @@ class PricingInfo:
         ), "product_pricing must be a ProductID:ProductPricing dictionary"
 
         if isinstance(product_pricings, dict):
-            assert all(
-                isinstance(key, str) for key in product_pricings
-            ), "Pricing Keys must all be Product id's (str)"
+            pricings_by_code: dict[str, ProductPricing] = {}
+            for code, pricing in product_pricings.items():
+                if validate:
+                    if not isinstance(code, str):
+                        raise ValueError("Pricing Keys must all be Product id's (str)")
+                    if not isinstance(pricing, ProductPricing):
+                        raise ValueError("Pricing Values must all be ProductPricing's")
+                pricings_by_code[sys.intern(code)] = pricing
 
-            assert all(
-                isinstance(val, ProductPricing) for val in product_pricings.values()
-            ), "Pricing Values must all be ProductPricing's"
-
-            self.product_pricings = product_pricings
+            self.product_pricings = pricings_by_code
 
         elif isinstance(product_pricings, List):
-            assert all(isinstance(val, ProductPricing) for val in product_pricings)
+            pricings_by_id: dict[str, ProductPricing] = {}
+            for pricing in product_pricings:
+                if validate and not isinstance(pricing, ProductPricing):
+                    raise ValueError("Pricings must all be ProductPricing's")
+                pricings_by_id[sys.intern(pricing.product.id)] = pricing
 
-            self.product_pricings = {
-                pricing.product.id: pricing for pricing in product_pricings
-            }
+            self.product_pricings = pricings_by_id
 
         else:
             raise ValueError("Invalid Input Type for product_pricing")
@@ -179,22 +224,50 @@ class PricingInfo:
         Returns:
             BasketItem: The `BasketItem` encapsulation of the dictionary
         """
+        return BasketItem(*self._dict_to_code_and_quantity(item))
+
+    def _dict_to_code_and_quantity(
+        self, item: Dict[str, Union[str, int]]
+    ) -> Tuple[str, int]:
+        """Validates a basket item `dict` and returns its code and quantity.
+
+        Args:
+            item (Dict[str, Union[str, int]]): A valid `dict` with the structure
+            `{"code": (str), "quantity": (int > 0)}`
+
+        Raises:
+            ValueError: Invalid `dict` for a basket item
+
+        Returns:
+            Tuple[str, int]: The code and quantity of the item
+        """
         try:
-            assert (
-                "code" in item and "quantity" in item
-            ), "Items must include 'code' and 'quantity"
-            assert isinstance(
-                item["code"], str
-            ), f"'code' value must be a string, is {type(item['code'])}"
-            assert isinstance(
-                item["quantity"], int
-            ), f"'quantity' value must be a int, is {type(item['code'])}"
-        except AssertionError as ex:
-            raise ValueError(f"Invalid format for basket item {item}") from ex
+            code, quantity = _get_code_and_quantity(item)
+        except (KeyError, TypeError) as ex:
+            raise ValueError(
+                f"Invalid format for basket item {item}, items must include 'code' and"
+                " 'quantity'"
+            ) from ex
+
+        if type(code) is not str:
+            raise ValueError(
+                f"Invalid format for basket item {item}, 'code' value must be a string, is"
+                f" {type(code).__name__}"
+            )
+        if type(quantity) is not int:
+            raise ValueError(
+                f"Invalid format for basket item {item}, 'quantity' value must be an int, is"
+                f" {type(quantity).__name__}"
+            )
+        if quantity < 0:
+            raise ValueError(
+                f"Invalid format for basket item {item}, 'quantity' value must be >= 0"
+            )
 
-        return BasketItem(item["code"], item["quantity"])
+        # Interned so that pricing lookups can match codes by identity
+        return sys.intern(code), quantity
 
-    def calculate_item_cost(self, item: BasketItem) -> float:
+    def calculate_item_cost(self, item: BasketItem) -> int:
         """Calculates the sum cost of a single `BasketItem`, including modifiers.`
 
         Args:
@@ -204,63 +277,322 @@ class PricingInfo:
             ValueError: Invalid `BasketItem`
 
         Returns:
-            float: The sum cost of the `BasketItem`
+            int: The sum cost of the `BasketItem`
         """
-        try:
-            pricing = self.product_pricings[item.code]
-        except KeyError as ex:
-            raise ValueError(
-                f"Product {item.code} in basket does not have pricing data in"
-                " PricingInfo"
-            ) from ex
+        return self.calculate_item_cost_raw(item.code, item.quantity)
+
+    def calculate_item_cost_raw(self, code: str, quantity: int) -> int:
+        """Calculates the sum cost of a quantity of a product, including modifiers.
+
+        Equivalent to `calculate_item_cost`, without needing a `BasketItem`. The quantity is
+        expected to have already been validated.
+
+        Args:
+            code (str): The ID of the product to calculate the cost of.
+            quantity (int): The quantity of the product.
+
+        Raises:
+            ValueError: Product has no pricing data.
 
-        if pricing.price_modifier is not None:
-            item_price = pricing.price_modifier.modified_price(
-                pricing.unit_price, item.quantity
+        Returns:
+            int: The sum cost of the quantity of the product
+        """
+        pricing = self.product_pricings.get(code)
+        if pricing is None:
+            raise ValueError(
+                f"Product {code} in basket does not have pricing data in PricingInfo"
             )
-        else:
-            item_price = item.quantity * pricing.unit_price
 
-        return item_price
+        price_modifier = pricing.price_modifier
+        if price_modifier is not None:
+            return price_modifier.modified_price(pricing.unit_price, quantity)
+
+        return quantity * pricing.unit_price
 
     def calculate_total_cost(
-        self, basket: List[BasketItem] | List[dict] | str
-    ) -> float:
+        self, basket: List[BasketItem] | List[dict] | str | bytes
+    ) -> int:
         """Calculates the total cost of a given basket
 
         Args:
-            basket (List[BasketItem] | List[dict] | str): The basket to calculate the total cost of.
-                Can be provided as a `List` of `BasketItem`s or valid `dict`s, or as a JSON string
-                that evaluates as such.
+            basket (List[BasketItem] | List[dict] | str | bytes): The basket to calculate the
+                total cost of. Can be provided as a `List` of `BasketItem`s or valid `dict`s, or
+                as a JSON string (or bytes) that evaluates as such. Quantities of the same
+                product are combined before pricing.
+
+        Raises:
+            ValueError: Invalid input basket.
+
+        Returns:
+            int: The total cost of the basket.
+        """
+        return self._total(*self._normalize(basket))
+
+    def _normalize(
+        self, basket: List[BasketItem] | List[dict] | str | bytes
+    ) -> Tuple[List[str], List[int]]:
+        """Validates a basket and converts it into parallel lists of product codes and
+        quantities.
+
+        Args:
+            basket (List[BasketItem] | List[dict] | str | bytes): The basket, in any of the forms
+                accepted by `calculate_total_cost`.
 
         Raises:
             ValueError: Invalid input basket.
 
         Returns:
-            float: The total cost of the basket.
+            Tuple[List[str], List[int]]: The product code and quantity of each basket item.
         """
-        if isinstance(basket, str):
+        if isinstance(basket, (str, bytes, bytearray)):
             try:
-                basket = json.loads(basket)
-            except json.JSONDecodeError as ex:
+                basket = _json.loads(basket)
+            # simdjson raises RuntimeError for JSON it can't represent, such as integers too
+            # .. large for 64 bits, or documents nested too deeply
+            except (ValueError, RuntimeError) as ex:
                 raise ValueError("Invalid JSON") from ex
 
-        if isinstance(basket, List):
-            if all(isinstance(item, BasketItem) for item in basket):
-                pass
-            elif all(isinstance(item, dict) for item in basket):
-                basket = [self.dict_to_basket_item(item) for item in basket]  # type: ignore
+            codes_and_quantities = self._json_to_codes_and_quantities(basket)
+            if codes_and_quantities is not None:
+                return codes_and_quantities
+
+        if not isinstance(basket, List):
+            raise ValueError("Invalid Basket Format, basket must be a list")
+
+        codes: List[str] = []
+        quantities: List[int] = []
+        for item in basket:
+            if isinstance(item, dict):
+                code, quantity = self._dict_to_code_and_quantity(item)
+            elif isinstance(item, BasketItem):
+                code, quantity = item.code, item.quantity
             else:
                 raise ValueError(
                     "Invalid Basket Format, all elements of basket must be either a"
                     " dict or a BasketItem"
                 )
-        else:
-            raise ValueError("Invalid Basket Format, basket must be a list")
+            codes.append(code)
+            quantities.append(quantity)
 
-        total_cost = 0
+        return codes, quantities
 
-        for item in basket:
-            total_cost += self.calculate_item_cost(item)  # type: ignore
+    def _json_to_codes_and_quantities(
+        self, basket
+    ) -> Optional[Tuple[List[str], List[int]]]:
+        """Converts a parsed JSON basket of valid `dict`s into lists of codes and quantities in
+        bulk.
+
+        Args:
+            basket: The parsed JSON basket.
+
+        Returns:
+            Optional[Tuple[List[str], List[int]]]: The product code and quantity of each basket
+                item, or None if the basket is not a `list` of valid `dict`s, leaving the error
+                to be found item by item.
+        """
+        if not isinstance(basket, list):
+            return None
+
+        # Parsed JSON only holds dicts, lists and scalars, of which only dicts can be indexed by
+        # .. a str, so this will fail for any element that isn't a dict
+        try:
+            codes = [item["code"] for item in basket]
+            quantities = [item["quantity"] for item in basket]
+        except (KeyError, TypeError):
+            return None
+
+        if not all(type(code) is str for code in codes) or not all(
+            type(quantity) is int and quantity >= 0 for quantity in quantities
+        ):
+            return None
+
+        return list(map(sys.intern, codes)), quantities
+
+    def _total(self, codes: Iterable[str], quantities: Iterable[int]) -> int:
+        """Calculates the total cost of a basket of validated product codes and quantities.
+
+        Quantities are totalled per product before pricing, so that each product is only priced
+        once, and modifiers such as combo deals apply across separate entries of a product.
+
+        Args:
+            codes (Iterable[str]): The product code of each basket item.
+            quantities (Iterable[int]): The quantity of each basket item.
+
+        Raises:
+            ValueError: Product in basket has no pricing data.
+
+        Returns:
+            int: The total cost of the basket.
+        """
+        quantities_by_code: Dict[str, int] = {}
+        for code, quantity in zip(codes, quantities):
+            quantities_by_code[code] = quantities_by_code.get(code, 0) + quantity
+
+        return sum(starmap(self.calculate_item_cost_raw, quantities_by_code.items()))
+
+    def calculate_total_cost_iter(self, basket: Iterable[BasketItem]) -> int:
+        """Calculates the total cost of a basket provided as an iterable of `BasketItem`s.
+
+        Unlike `calculate_total_cost`, the basket is consumed one item at a time, so it can be
+        given as a generator without the whole basket being held in memory. Quantities of the
+        same product are combined before pricing.
+
+        Args:
+            basket (Iterable[BasketItem]): The `BasketItem`s to calculate the total cost of.
+
+        Raises:
+            ValueError: Invalid `BasketItem` in basket.
+
+        Returns:
+            int: The total cost of the basket.
+        """
+        # `_total` consumes both in step, so tee only ever holds a single item
+        code_items, quantity_items = tee(map(_check_basket_item, basket))
+        return self._total(
+            (item.code for item in code_items),
+            (item.quantity for item in quantity_items),
+        )
+
+    def calculate_total_cost_batch(
+        self, codes: Sequence[str], quantities: Sequence[int]
+    ) -> int:
+        """Calculates the total cost of a large basket, provided as parallel arrays of product
+        codes and quantities.
+
+        Quantities are combined per product. When given as `numpy` arrays of ints, all products are
+        then priced in a single vectorised pass. Otherwise, they are priced as in
+        `calculate_total_cost`.
+
+        Args:
+            codes (Sequence[str]): The product code of each basket item.
+            quantities (Sequence[int]): The quantity of each basket item.
+
+        Raises:
+            ValueError: Invalid input basket.
+
+        Returns:
+            int: The total cost of the basket.
+        """
+        # Task Comment: numpy is optional, and only imported here so that importing this module
+        # .. stays fast for the majority of uses, which never price in bulk
+        try:
+            import numpy as np  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            np = None
+
+        # Task Comment: Only arrays of fixed-width ints are priced in a vectorised pass, as
+        # .. converting anything else into arrays costs more than it saves. Quantities too large
+        # .. for fixed-width ints give arrays of Python objects, which are priced the same way.
+        if (
+            np is None
+            or not isinstance(codes, np.ndarray)
+            or not isinstance(quantities, np.ndarray)
+            or quantities.dtype == object
+        ):
+            if np is not None and isinstance(quantities, np.ndarray):
+                quantities = quantities.tolist()
+            if np is not None and isinstance(codes, np.ndarray):
+                codes = codes.tolist()
+
+            if len(codes) != len(quantities):
+                raise ValueError("codes and quantities must be the same length")
+            if not all(
+                type(quantity) is int and quantity >= 0 for quantity in quantities
+            ):
+                raise ValueError("Quantities must be ints >= 0")
+
+            return self._total(codes, quantities)
+
+        if codes.ndim != 1 or codes.shape != quantities.shape:
+            raise ValueError(
+                "codes and quantities must be 1D arrays of the same length"
+            )
+        if quantities.size and (
+            not np.issubdtype(quantities.dtype, np.integer) or quantities.min() < 0
+        ):
+            raise ValueError("Quantities must be ints >= 0")
+
+        # Each distinct product is looked up once, rather than once per basket item
+        product_codes, code_indexes = np.unique(codes, return_inverse=True)
+        product_codes = product_codes.tolist()
+
+        # Rebuilt on every call, so that changes made to the pricings are always reflected
+        other_modifier_idxs, unit_prices, combo_prices, per_amounts = self._compile(
+            product_codes
+        )
+
+        # Each product costs at most its quantity times its largest price, so if that can't
+        # .. exceed int64 for the whole basket, neither can any of the array arithmetic.
+        # .. Otherwise, the basket is priced with Python ints, which can't overflow.
+        max_quantity = int(quantities.max()) if quantities.size else 0
+        max_price = max(
+            (
+                abs(price)
+                for price in chain(unit_prices.tolist(), combo_prices.tolist())
+            ),
+            default=0,
+        )
+        if codes.size * max_quantity * (max_price + 1) > _INT64_MAX:
+            return self._total(codes.tolist(), quantities.tolist())
+
+        product_quantities = np.zeros(len(product_codes), dtype=np.int64)
+        np.add.at(product_quantities, code_indexes.ravel(), quantities)
+
+        product_costs = _combo_vec(
+            combo_prices, per_amounts, unit_prices, product_quantities
+        )
+
+        # Modifiers other than combo-deals can't be expressed in the tables, so are priced
+        # .. separately, with Python ints
+        other_modifier_costs = 0
+        for idx in other_modifier_idxs:
+            pricing = self.product_pricings[product_codes[idx]]
+            product_costs[idx] = 0
+            other_modifier_costs += pricing.price_modifier.modified_price(  # type: ignore
+                pricing.unit_price, int(product_quantities[idx])
+            )
+
+        return product_costs.sum().item() + other_modifier_costs
+
+    def _compile(self, codes: List[str]):
+        """Builds flat, per-product arrays of the pricing data for use in bulk pricing.
+
+        Products without a combo-deal have a `per_amount` of 1 and a `combo_price` equal to their
+        unit price.
+
+        Args:
+            codes (List[str]): The product codes to build the arrays for, in order.
+
+        Raises:
+            ValueError: A product has no pricing data in this PricingInfo.
+
+        Returns:
+            tuple: The indexes of products with modifiers other than combo-deals, and the
+                `unit_prices`, `combo_prices` and `per_amounts` arrays.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        other_modifier_idxs = []
+
+        unit_prices = np.empty(len(codes), dtype=np.int64)
+        combo_prices = np.empty(len(codes), dtype=np.int64)
+        per_amounts = np.ones(len(codes), dtype=np.int64)
+
+        for idx, code in enumerate(codes):
+            pricing = self.product_pricings.get(code)
+            if pricing is None:
+                raise ValueError(
+                    f"Product {code} in basket does not have pricing data in"
+                    " PricingInfo"
+                )
+
+            unit_prices[idx] = pricing.unit_price
+            combo_prices[idx] = pricing.unit_price
+
+            if isinstance(pricing.price_modifier, ComboDealPriceModifier):
+                combo_prices[idx] = pricing.price_modifier.combo_price
+                per_amounts[idx] = pricing.price_modifier.per_amount
+            elif pricing.price_modifier is not None:
+                other_modifier_idxs.append(idx)
 
-        return total_cost
+        return other_modifier_idxs, unit_prices, combo_prices, per_amounts
@@ -14,9 +14,15 @@ If provided with the command argument `--i` or `--input` followed by a filename,
 then `TerminalCheckout will instead use the JSON found in the given filename.
 """
 
-import json
+from itertools import chain
 import sys
-from typing import List
+from typing import List, Optional
+
+# Task Comment: ijson is optional, allowing input files to be streamed rather than read whole.
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 from .checkout import (
     Product,
@@ -39,7 +45,8 @@ pricing_info = PricingInfo(
         ),
         ProductPricing(Product("C"), unit_price=25),
         ProductPricing(Product("D"), unit_price=12),
-    ]
+    ],
+    validate=False,
 )
 
 
@@ -53,10 +60,12 @@ def cause_stack(exception: BaseException) -> List[BaseException]:
     Returns:
         List[BaseException]: An ordered list of exceptions caused by exceptions.
     """
-    if exception.__cause__ is None:
-        return [exception]
-    else:
-        return [exception] + cause_stack(exception.__cause__)
+    causes: List[BaseException] = []
+    cause: Optional[BaseException] = exception
+    while cause is not None:
+        causes.append(cause)
+        cause = cause.__cause__
+    return causes
 
 
 def format_causes(exception: BaseException) -> str:
@@ -72,6 +81,36 @@ def format_causes(exception: BaseException) -> str:
     return "\n - caused by -\n".join([str(cause) for cause in cause_stack(exception)])
 
 
+def print_json_error(exception: BaseException):
+    """Prints a message for input JSON that failed to parse.
+
+    Args:
+        exception (BaseException): The error raised by the JSON parser.
+    """
+    print(
+        f"""Input JSON failed to parse.
+JSON Error:
+===
+{exception}
+==="""
+    )
+
+
+def print_invalid_input(exception: BaseException):
+    """Prints a message for input that could not be used to calculate a total cost.
+
+    Args:
+        exception (BaseException): The error raised for the invalid input.
+    """
+    print(
+        f"""
+Invalid Input:
+===
+{format_causes(exception)}
+==="""
+    )
+
+
 def try_input(input_json: str):
     """Try to find the total cost of a given JSON string
 
@@ -81,22 +120,8 @@ def try_input(input_json: str):
     try:
         total_cost = pricing_info.calculate_total_cost(input_json)
         print("Total Cost of Order: ", total_cost)
-    except json.JSONDecodeError as ex:
-        print(
-            f"""Input JSON failed to parse.
-            JSON Error:
-            ===
-            {ex}
-            ==="""
-        )
     except (ValueError, AssertionError) as ex:
-        print(
-            f"""
-Invalid Input:
-===
-{format_causes(ex)}
-==="""
-        )
+        print_invalid_input(ex)
 
 
 def interactive_mode():
@@ -118,14 +143,38 @@ def interactive_mode():
 def use_input_file(filename: str):
     """Reads the input file and uses it's contents as the JSON data source to calculate total cost
 
+    If `ijson` is installed, the basket items are streamed from the file rather than read whole,
+    in which case the file contents are not echoed to the terminal.
+
     Args:
         filename (str): The name of the file to read input JSON from
     """
-    with open(filename) as file:
-        file_contents = file.read()
-        print("Input File Contents:")
-        print(file_contents)
-        try_input(file_contents)
+    if ijson is None:
+        with open(filename) as file:
+            file_contents = file.read()
+            print("Input File Contents:")
+            print(file_contents)
+            try_input(file_contents)
+        return
+
+    # Stream the basket items from the file one at a time rather than reading it whole
+    with open(filename, "rb") as file:
+        try:
+            events = ijson.parse(file)
+            first_event = next(events, None)
+            if first_event is None or first_event[1] != "start_array":
+                raise ValueError("Invalid Basket Format, basket must be a list")
+
+            basket = (
+                pricing_info.dict_to_basket_item(item)
+                for item in ijson.items(chain([first_event], events), "item")
+            )
+            total_cost = pricing_info.calculate_total_cost_iter(basket)
+            print("Total Cost of Order: ", total_cost)
+        except ijson.JSONError as ex:
+            print_json_error(ex)
+        except (ValueError, AssertionError) as ex:
+            print_invalid_input(ex)
 
 
 if __name__ == "__main__":
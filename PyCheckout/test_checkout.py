@@ -4,8 +4,12 @@
 # .. Pylint must be told to be quiet about this or it will whine every time a fixture is used
 # pylint: disable=redefined-outer-name
 
+import copy
+import json
+
 import pytest
 from .checkout import *
+from .terminal_checkout import use_input_file
 
 
 @pytest.fixture
@@ -33,7 +37,7 @@ def basket() -> List[BasketItem]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def combo_price_modifier() -> ComboDealPriceModifier:
     """Pytest fixture providing a basic ComboDealPriceModifier
 
@@ -44,7 +48,7 @@ def combo_price_modifier() -> ComboDealPriceModifier:
     return ComboDealPriceModifier(combo_price=140, per_amount=3)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def pricing_info() -> PricingInfo:
     """Pytest fixture providing a basic PricingInfo
 
@@ -70,7 +74,7 @@ def pricing_info() -> PricingInfo:
     return pricing_info
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def input_as_json() -> str:
     """Pytest fixture providing a basic JSON input
 
@@ -83,7 +87,17 @@ def input_as_json() -> str:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def input_as_parsed(input_as_json: str) -> List:
+    """Pytest fixture providing the basic JSON input, parsed
+
+    Returns:
+        List: The basic JSON basket, parsed
+    """
+    return json.loads(input_as_json)
+
+
+@pytest.fixture(scope="session")
 def input_as_object() -> List:
     """Pytest fixture providing a basic input
 
@@ -98,6 +112,16 @@ def input_as_object() -> List:
     ]
 
 
+@pytest.fixture(scope="session")
+def input_by_code(input_as_object: List[dict]) -> Dict[str, dict]:
+    """Pytest fixture providing the basic input indexed by product code
+
+    Returns:
+        Dict[str, dict]: The items of the basic basket, by product code
+    """
+    return {item["code"]: item for item in input_as_object}
+
+
 def test_product_id_is_name(product: Product):
     """Checks the product id is the product name."""
     assert product.id == product.name
@@ -120,9 +144,13 @@ def test_combo_price_modifier_bad_input(combo_price_modifier: ComboDealPriceModi
         combo_price_modifier.modified_price(5, "the bee should not be able to fly")
     with pytest.raises(ValueError):
         combo_price_modifier.modified_price(5, 5.5)
+    with pytest.raises(ValueError):
+        combo_price_modifier.modified_price(5.5, 1)
 
     with pytest.raises(ValueError):
         ComboDealPriceModifier("the bee, of course", 5)
+    with pytest.raises(ValueError):
+        ComboDealPriceModifier(5.5, 5)
     with pytest.raises(ValueError):
         ComboDealPriceModifier(5, "flies anyway")
     with pytest.raises(ValueError):
@@ -134,6 +162,28 @@ def test_combo_price_modifier_bad_input(combo_price_modifier: ComboDealPriceModi
 def test_pricing_info_json_parsing(pricing_info: PricingInfo, input_as_json: str):
     """Checks that PricingInfo can parse a correct JSON input"""
     assert pricing_info.calculate_total_cost(input_as_json) == 284
+    assert pricing_info.calculate_total_cost(input_as_json.encode()) == 284
+
+
+def test_pricing_info_json_parsing_matches_object(
+    pricing_info: PricingInfo, input_as_json: str, input_as_parsed: List
+):
+    """Checks that PricingInfo gives the same cost for a JSON input as for it already parsed"""
+    assert pricing_info.calculate_total_cost(
+        input_as_json
+    ) == pricing_info.calculate_total_cost(input_as_parsed)
+
+
+def test_pricing_info_json_large_integer(pricing_info: PricingInfo):
+    """Checks that a JSON quantity too large for 64 bit ints is priced exactly, or rejected as
+    invalid, depending on the JSON parser installed"""
+    quantity = 123456789012345678901234567890
+    basket_json = f'[{{"code":"C","quantity":{quantity}}}]'
+    try:
+        total_cost = pricing_info.calculate_total_cost(basket_json)
+    except ValueError:
+        return
+    assert total_cost == quantity * 25
 
 
 @pytest.mark.parametrize(
@@ -147,7 +197,7 @@ def test_pricing_info_json_parsing(pricing_info: PricingInfo, input_as_json: str
 )
 def test_pricing_info_calculation(
     pricing_info: PricingInfo,
-    input_as_object: List[dict],
+    input_by_code: Dict[str, dict],
     expected_cost,
     a_combo_price_mod,
     a_unit_price_mod,
@@ -155,27 +205,119 @@ def test_pricing_info_calculation(
     d_unit_price_mod,
 ):
     """Checks that PricingInfo performs the calculations correctly"""
+    # The fixtures are shared between tests, so are copied before being modified
+    pricing_info = copy.deepcopy(pricing_info)
+    input_by_code = copy.deepcopy(input_by_code)
+
     pricings_a: ProductPricing = pricing_info.product_pricings["A"]
     pricings_a.unit_price += a_unit_price_mod
     pricings_d: ProductPricing = pricing_info.product_pricings["D"]
     pricings_d.unit_price += d_unit_price_mod
 
-    a_basket_item = next((item for item in input_as_object if item["code"] == "A"))
+    a_basket_item = input_by_code["A"]
     a_basket_item["quantity"] += a_quantity_mod
 
     modifier_a = pricings_a.price_modifier
     if isinstance(modifier_a, ComboDealPriceModifier):
         modifier_a.combo_price = modifier_a.combo_price + a_combo_price_mod
 
-        assert pricing_info.calculate_total_cost(input_as_object) == expected_cost
+        basket = list(input_by_code.values())
+        assert pricing_info.calculate_total_cost(basket) == expected_cost
     else:
         pytest.fail("A_modifier should be ComboDealPriceModifier")
 
 
+def test_pricing_info_combines_duplicate_items(pricing_info: PricingInfo):
+    """Checks that combo deals apply across separate basket entries of the same product"""
+    basket = [BasketItem("A", 2), BasketItem("C", 1), BasketItem("A", 1)]
+    assert pricing_info.calculate_total_cost(basket) == 165
+
+
+def test_pricing_info_iter_calculation(
+    pricing_info: PricingInfo, input_as_object: List[dict]
+):
+    """Checks that PricingInfo calculates the total cost of a basket given as a generator"""
+    basket = (pricing_info.dict_to_basket_item(item) for item in input_as_object)
+    assert pricing_info.calculate_total_cost_iter(basket) == 284
+
+    with pytest.raises(ValueError):
+        pricing_info.calculate_total_cost_iter(iter([BasketItem("A", 1), 5]))
+
+
+def test_pricing_info_batch_calculation(pricing_info: PricingInfo):
+    """Checks that PricingInfo calculates the total cost of a basket given as arrays"""
+    codes = ["A", "B", "C", "D", "A"]
+    quantities = [2, 3, 1, 2, 1]
+    assert pricing_info.calculate_total_cost_batch(codes, quantities) == 284
+
+    with pytest.raises(ValueError):  # Non existent product
+        pricing_info.calculate_total_cost_batch(["E"], [1])
+    with pytest.raises(ValueError):
+        pricing_info.calculate_total_cost_batch(["A"], [-1])
+    with pytest.raises(ValueError):
+        pricing_info.calculate_total_cost_batch(["A"], [1.5])
+    with pytest.raises(ValueError):
+        pricing_info.calculate_total_cost_batch(["A", "B"], [1])
+
+
+def test_pricing_info_batch_large_quantities(pricing_info: PricingInfo):
+    """Checks that bulk pricing gives exact totals that don't fit in 64 bit ints"""
+    for codes, quantities in [
+        (["A"], [2**62]),
+        (["A", "B", "A"], [2**62] * 3),
+        (["A", "C"], [2**64, 1]),
+    ]:
+        basket = [{"code": c, "quantity": q} for c, q in zip(codes, quantities)]
+        assert pricing_info.calculate_total_cost_batch(
+            codes, quantities
+        ) == pricing_info.calculate_total_cost(basket)
+
+
+def test_pricing_info_batch_calculation_arrays(pricing_info: PricingInfo):
+    """Checks that PricingInfo calculates the total cost of a basket given as numpy arrays"""
+    np = pytest.importorskip("numpy")
+
+    codes = np.array(["A", "B", "C", "D", "A"])
+    quantities = np.array([2, 3, 1, 2, 1])
+    assert pricing_info.calculate_total_cost_batch(codes, quantities) == 284
+    assert pricing_info.calculate_total_cost_batch(codes[:0], quantities[:0]) == 0
+
+    # Too large for fixed-width ints, so an array of Python objects
+    quantities = np.array([2**64, 1], dtype=object)
+    assert pricing_info.calculate_total_cost_batch(
+        np.array(["A", "C"]), quantities
+    ) == pricing_info.calculate_total_cost(
+        [{"code": "A", "quantity": 2**64}, {"code": "C", "quantity": 1}]
+    )
+
+    with pytest.raises(ValueError):  # Non existent product
+        pricing_info.calculate_total_cost_batch(np.array(["E"]), np.array([1]))
+    with pytest.raises(ValueError):
+        pricing_info.calculate_total_cost_batch(np.array(["A"]), np.array([-1]))
+    with pytest.raises(ValueError):
+        pricing_info.calculate_total_cost_batch(np.array(["A"]), np.array([1.5]))
+    with pytest.raises(ValueError):
+        pricing_info.calculate_total_cost_batch(np.array(["A", "B"]), np.array([1]))
+
+
+def test_pricing_info_batch_reflects_changed_pricing(pricing_info: PricingInfo):
+    """Checks that bulk pricing uses pricings changed after a previous calculation"""
+    pricing_info = copy.deepcopy(pricing_info)
+    assert pricing_info.calculate_total_cost_batch(["A"], [1]) == 50
+
+    pricing_info.product_pricings["A"].unit_price = 60
+    assert pricing_info.calculate_total_cost_batch(["A"], [1]) == 60
+    assert pricing_info.calculate_total_cost([{"code": "A", "quantity": 1}]) == 60
+
+
 def test_pricing_info_bad_input(pricing_info: PricingInfo):
     """Checks that PricingInfo raises errors on bad input"""
     with pytest.raises(ValueError):
         pricing_info.calculate_total_cost("not json")
+    with pytest.raises(ValueError):
+        pricing_info.calculate_total_cost('[{"code": "A", "quantity": 1}, 5]')
+    with pytest.raises(ValueError):
+        pricing_info.calculate_total_cost('[{"code": "A", "quantity": -1}]')
     with pytest.raises(ValueError):
         pricing_info.calculate_total_cost(  # not a list of basket items
             [
@@ -195,3 +337,38 @@ def test_pricing_info_bad_input(pricing_info: PricingInfo):
     ]:
         with pytest.raises(ValueError):
             pricing_info.calculate_total_cost(bad_input)
+
+
+def test_pricing_info_invalid_pricings(pricing_info: PricingInfo):
+    """Checks that PricingInfo rejects invalid pricings given as a dictionary or list"""
+    pricing = pricing_info.product_pricings["A"]
+    assert PricingInfo({"A": pricing}).product_pricings == {"A": pricing}
+
+    for bad_pricings in [{5: pricing}, {"A": 50}, [50]]:
+        with pytest.raises(ValueError):
+            PricingInfo(bad_pricings)
+
+
+@pytest.mark.parametrize(
+    "file_contents,expected_output",
+    [
+        (
+            '[{"code":"A","quantity":3},{"code":"C","quantity":1}]',
+            "Total Cost of Order:  165",
+        ),
+        ('{"code":"A","quantity":3}', "basket must be a list"),
+        ("5", "basket must be a list"),
+        ('[{"code":"A",', "JSON"),
+    ],
+)
+def test_use_input_file(tmp_path, capsys, file_contents: str, expected_output: str):
+    """Checks that the terminal checkout prices input files, and reports invalid ones"""
+    input_file = tmp_path / "input.json"
+    input_file.write_text(file_contents)
+
+    use_input_file(str(input_file))
+
+    output = capsys.readouterr().out
+    assert expected_output in output
+    if not expected_output.startswith("Total Cost"):
+        assert "Total Cost of Order" not in output